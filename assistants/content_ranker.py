@@ -3,17 +3,32 @@ Content Ranker - AI-powered content relevance scoring using embeddings
 """
 
 import logging
+import hashlib
 from typing import List, Dict, Any
 import os
 from openai import OpenAI
 import numpy as np
+import diskcache
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", None)
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Truncated embedding size (text-embedding-3 models support shortening)
+EMBEDDING_DIMENSIONS = 512
+
+# Maximum number of inputs sent in a single embeddings request
+EMBEDDING_BATCH_SIZE = 96
+
+EMBEDDING_CACHE_DIR = "data/embeddings_cache"
+
 class ContentRanker:
-    def __init__(self, openai_api_key: str = OPENAI_API_KEY):
+    def __init__(self, openai_api_key: str = OPENAI_API_KEY, cache_dir: str = EMBEDDING_CACHE_DIR):
         self.logger = logging.getLogger("content_ranker")
         
+        # Embeddings persisted across runs, keyed by model + text hash
+        self.cache = diskcache.Cache(cache_dir)
+        
         # Standard AI relevance sentence to compare against
         self.reference_text = (
             "artificial intelligence research or developments that is both groundbreaking and practical, "
@@ -21,6 +36,9 @@ class ContentRanker:
             "that teach data science and machine learning skills."
         )
         
+        # Normalised reference embedding, computed on first use
+        self._ref_embedding = None
+        
         self.client = None
         if openai_api_key:
             self.client = OpenAI(api_key=openai_api_key)
@@ -36,15 +54,23 @@ class ContentRanker:
             return articles
         
         try:
-            # Get reference embedding
-            ref_embedding = self._get_embedding(self.reference_text)
+            # Embed all articles in one batched request
+            texts = [f"{article.get('title', '')} {article.get('summary', '')}" for article in articles]
+            article_embeddings = self._get_embeddings(texts)
+            r = self._reference_embedding()
             
-            # Score each article
-            for article in articles:
-                text = f"{article.get('title', '')} {article.get('summary', '')}"
-                article_embedding = self._get_embedding(text)
-                similarity = self._cosine_similarity(ref_embedding, article_embedding)
-                article["relevance_score"] = similarity
+            # Cosine similarity of every article against the reference in one matmul;
+            # articles whose embedding failed keep a score of 0
+            scores = np.zeros(len(articles), dtype=np.float32)
+            valid = [i for i, embedding in enumerate(article_embeddings) if len(embedding)]
+            if len(r) and valid:
+                M = np.asarray([article_embeddings[i] for i in valid], dtype=np.float32)
+                # Row norms via einsum: one fused multiply-add pass, no (N, D) temporary
+                M /= np.sqrt(np.einsum('ij,ij->i', M, M))[:, None] + 1e-12
+                scores[valid] = M @ r
+            
+            for article, score in zip(articles, scores):
+                article["relevance_score"] = float(score)
             
             # Sort by score (highest first)
             ranked = sorted(articles, key=lambda x: x["relevance_score"], reverse=True)
@@ -64,29 +90,64 @@ class ContentRanker:
         ranked_articles = self.score_content_relevance(articles)
         return ranked_articles[:top_x]
     
-    def _get_embedding(self, text: str) -> List[float]:
-        """Get OpenAI embedding for text"""
+    def _reference_embedding(self) -> np.ndarray:
+        """Get the L2-normalised reference embedding, embedding it only once"""
+        if self._ref_embedding is None:
+            embedding = self._get_embeddings([self.reference_text])[0]
+            if not len(embedding):
+                return embedding  # Don't keep a failed lookup; retry on the next call
+            self._ref_embedding = embedding / (np.sqrt(np.dot(embedding, embedding)) + 1e-12)
+        return self._ref_embedding
+    
+    def _get_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Get OpenAI embeddings for a list of texts, using the disk cache where possible"""
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = []
+        missing = []
+        
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                embeddings.append(np.frombuffer(cached, dtype=np.float32))
+            else:
+                embeddings.append(np.empty(0, dtype=np.float32))
+                missing.append(i)
+        
+        if missing:
+            self.logger.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+            fetched = self._fetch_embeddings([texts[i] for i in missing])
+            for i, embedding in zip(missing, fetched):
+                if embedding:
+                    embeddings[i] = np.asarray(embedding, dtype=np.float32)
+                    self.cache.set(keys[i], embeddings[i].tobytes())
+        
+        return embeddings
+    
+    def _fetch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Request OpenAI embeddings for a list of texts, batching the requests"""
         if not self.client:
             self.logger.warning("OpenAI client not available")
-            return []
+            return [[] for _ in texts]
         
-        try:
-            response = self.client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=text
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            self.logger.error(f"Error getting embedding: {e}")
-            return []
-    
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        """Calculate cosine similarity"""
-        if not a or not b:
-            return 0.0
+        embeddings = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            batch = texts[start:start + EMBEDDING_BATCH_SIZE]
+            try:
+                response = self.client.embeddings.create(
+                    model=EMBEDDING_MODEL,
+                    input=batch,
+                    dimensions=EMBEDDING_DIMENSIONS
+                )
+                embeddings.extend(d.embedding for d in response.data)
+            except Exception as e:
+                self.logger.error(f"Error getting embeddings: {e}")
+                embeddings.extend([] for _ in batch)
         
-        a_np, b_np = np.array(a), np.array(b)
-        return np.dot(a_np, b_np) / (np.linalg.norm(a_np) * np.linalg.norm(b_np))
+        return embeddings
+    
+    def _cache_key(self, text: str) -> str:
+        """Cache key for an embedding of text under the current model and size"""
+        return hashlib.sha1(f"{EMBEDDING_MODEL}|{EMBEDDING_DIMENSIONS}|{text}".encode("utf-8")).hexdigest()
 
 
 # Test function
@@ -2,65 +2,113 @@
 Idea Generator - AI-powered content idea creation from research sources
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
 from typing import List, Dict, Any
-from openai import OpenAI
+from openai import AsyncOpenAI
+import diskcache
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", None)
 
+IDEA_MODEL = "gpt-4o-mini"
+
+# Room for a post and an article idea of up to 5 sentences each plus the JSON wrapper;
+# a reply cut off at the limit is invalid JSON
+IDEA_MAX_TOKENS = 350
+
+# Bump when the prompt changes so cached ideas are regenerated
+PROMPT_VERSION = "v2"
+
+IDEA_CACHE_DIR = "data/idea_cache"
+
+# Placeholders stored when generation fails; the pipeline retries articles carrying them
+FALLBACK_POST_IDEA = "Error generating post idea"
+FALLBACK_ARTICLE_IDEA = "Error generating article idea"
+
 class IdeaGenerator:
-    def __init__(self, openai_api_key: str = OPENAI_API_KEY):
+    def __init__(self, openai_api_key: str = OPENAI_API_KEY, max_concurrency: int = 16,
+                 cache_dir: str = IDEA_CACHE_DIR):
         self.logger = logging.getLogger("idea_generator")
         
-        self.client = None
-        if openai_api_key:
-            self.client = OpenAI(api_key=openai_api_key)
-        else:
+        # Generated ideas persisted across runs, keyed by model + prompt version + article text
+        self.cache = diskcache.Cache(cache_dir)
+        
+        # Maximum number of in-flight OpenAI requests (keep within your rate limits)
+        self.max_concurrency = max_concurrency
+        
+        self.api_key = openai_api_key
+        if not openai_api_key:
             self.logger.warning("No OpenAI API key provided")
     
     def create_content_ideas(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate post and article ideas for each source article"""
         
-        if not self.client:
+        if not self.api_key:
             self.logger.warning("OpenAI client not available, cannot generate ideas")
             return articles
         
-        enhanced_articles = []
+        return asyncio.run(self._gather(articles))
+    
+    async def _gather(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate ideas for all articles concurrently"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        for article in articles:
-            try:
-                # Extract title and summary
-                title = article.get('title', '')
-                summary = article.get('summary', article.get('description', ''))
-                
-                # Generate ideas using GPT-4 mini
-                post_idea, article_idea = self._generate_ideas_for_article(title, summary)
-                
-                # Create flattened result by copying original article and adding ideas
-                enhanced_article = article.copy()  # Copy all original data
-                enhanced_article.update({
-                    'post_idea': post_idea,
-                    'article_idea': article_idea
-                })
-                
-                enhanced_articles.append(enhanced_article)
-                
-            except Exception as e:
-                self.logger.error(f"Error generating ideas for article '{title}': {e}")
-                # Add fallback entry with original data
-                fallback_article = article.copy()
-                fallback_article.update({
-                    'post_idea': "Error generating post idea",
-                    'article_idea': "Error generating article idea"
-                })
-                enhanced_articles.append(fallback_article)
+        # The async client is bound to the running event loop, so open one per run
+        async with AsyncOpenAI(api_key=self.api_key) as client:
+            coros = [self._enhance_article(client, semaphore, article) for article in articles]
+            results = await asyncio.gather(*coros, return_exceptions=True)
         
-        return enhanced_articles
+        return [
+            self._fallback_article(article) if isinstance(result, BaseException) else result
+            for article, result in zip(articles, results)
+        ]
     
-    def _generate_ideas_for_article(self, title: str, summary: str) -> tuple:
+    async def _enhance_article(self, client: AsyncOpenAI, semaphore: asyncio.Semaphore,
+                               article: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy an article and add its generated post and article ideas"""
+        title = article.get('title', '')
+        
+        try:
+            # Extract summary
+            summary = article.get('summary', article.get('description', ''))
+            
+            # Generate ideas using GPT-4 mini
+            async with semaphore:
+                post_idea, article_idea = await self._generate_ideas_for_article(client, title, summary)
+            
+            # Create flattened result by copying original article and adding ideas
+            enhanced_article = article.copy()  # Copy all original data
+            enhanced_article.update({
+                'post_idea': post_idea,
+                'article_idea': article_idea
+            })
+            
+            return enhanced_article
+            
+        except Exception as e:
+            self.logger.error(f"Error generating ideas for article '{title}': {e}")
+            return self._fallback_article(article)
+    
+    def _fallback_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy an article with placeholder ideas after a generation failure"""
+        fallback_article = article.copy()
+        fallback_article.update({
+            'post_idea': FALLBACK_POST_IDEA,
+            'article_idea': FALLBACK_ARTICLE_IDEA
+        })
+        return fallback_article
+    
+    async def _generate_ideas_for_article(self, client: AsyncOpenAI, title: str, summary: str) -> tuple:
         """Generate post and article ideas for a single article using GPT-4 mini"""
         
+        key = self._cache_key(title, summary)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""
 Based on this research article, generate content ideas:
 
@@ -71,51 +119,41 @@ Please provide:
 1. ONE social media post idea (5 sentences max) - engaging, shareable content that highlights the key insight
 2. ONE article idea (5 sentences max) - a deeper dive or practical application of this research
 
-Format your response exactly like this:
-POST IDEA: [your post idea here]
-ARTICLE IDEA: [your article idea here]
+Respond with a JSON object exactly like this:
+{{"post": "your post idea here", "article": "your article idea here"}}
 """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await client.chat.completions.create(
+                model=IDEA_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a creative content strategist who generates engaging social media posts and article ideas based on AI/tech research. Keep responses concise and actionable."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=300,
-                temperature=0.7
+                max_tokens=IDEA_MAX_TOKENS,
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
-            content = response.choices[0].message.content.strip()
-            
-            # Parse the response
-            post_idea = ""
-            article_idea = ""
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                self.logger.warning(f"Idea response truncated at {IDEA_MAX_TOKENS} tokens for: {title[:80]}")
+                return FALLBACK_POST_IDEA, FALLBACK_ARTICLE_IDEA
             
-            lines = content.split('\n')
-            for line in lines:
-                if line.startswith('POST IDEA:'):
-                    post_idea = line.replace('POST IDEA:', '').strip()
-                elif line.startswith('ARTICLE IDEA:'):
-                    article_idea = line.replace('ARTICLE IDEA:', '').strip()
-            
-            # Fallback parsing if format isn't exact
-            if not post_idea or not article_idea:
-                parts = content.split('ARTICLE IDEA:')
-                if len(parts) == 2:
-                    post_part = parts[0].replace('POST IDEA:', '').strip()
-                    article_part = parts[1].strip()
-                    post_idea = post_part if post_part else "Generated post idea"
-                    article_idea = article_part if article_part else "Generated article idea"
-                else:
-                    post_idea = content[:150] + "..." if len(content) > 150 else content
-                    article_idea = "Related article opportunity"
+            ideas = json.loads(choice.message.content)
+            post_idea = ideas.get("post", "").strip() or "Generated post idea"
+            article_idea = ideas.get("article", "").strip() or "Generated article idea"
             
+            self.cache.set(key, (post_idea, article_idea))
             return post_idea, article_idea
             
         except Exception as e:
             self.logger.error(f"Error calling OpenAI API: {e}")
-            return "Error generating post idea", "Error generating article idea"
+            return FALLBACK_POST_IDEA, FALLBACK_ARTICLE_IDEA
+    
+    def _cache_key(self, title: str, summary: str) -> str:
+        """Cache key for the ideas generated from an article"""
+        text = f"{IDEA_MODEL}|{PROMPT_VERSION}|{title}|{summary}"
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
     
     def get_ideas_summary(self, articles_with_ideas: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Get a summary of generated ideas"""
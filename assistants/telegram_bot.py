@@ -2,15 +2,27 @@
 Simple Telegram Bot - Sends AI content summaries with weekly scheduling
 """
 import os
+import time
 import requests
+from collections import deque
 from datetime import datetime
 
 content_engine_https = os.getenv("CONTENT_ENGINE_HTTPS")
 
+# Bot API limits: about 30 messages per second overall and 1 per second per chat
+MESSAGES_PER_SECOND = 25
+CHAT_MESSAGE_INTERVAL = 1.0
+
 class TelegramBot:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        
+        # Reuse one keep-alive connection to the Bot API across calls
+        self.session = requests.Session()
+        
+        # Send times within the last second, for the token bucket in send_message
+        self._sent_times = deque()
     
     def set_chat_id(self):
         """Get your chat ID - run this first!"""
@@ -23,7 +35,7 @@ class TelegramBot:
             
         url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
         
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code == 200:
             data = response.json()
             if data['result']:
@@ -49,7 +61,17 @@ class TelegramBot:
         data = {'chat_id': self.chat_id, 'text': text}
         
         try:
-            response = requests.post(url, json=data)
+            self._wait_for_send_slot()
+            response = self.session.post(url, json=data)
+            
+            if response.status_code == 429:
+                # Flood control: wait as long as Telegram asks, then retry once
+                retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                print(f"Rate limited, retrying in {retry_after}s")
+                time.sleep(retry_after)
+                self._wait_for_send_slot()
+                response = self.session.post(url, json=data)
+            
             if response.status_code == 200:
                 print("Message sent!")
                 return True
@@ -60,6 +82,24 @@ class TelegramBot:
             print(f"Error: {e}")
             return False
     
+    def _wait_for_send_slot(self) -> None:
+        """Block until sending another message stays within the Bot API rate limits"""
+        now = time.monotonic()
+        
+        # Keep messages to this chat at least CHAT_MESSAGE_INTERVAL apart
+        if self._sent_times and now - self._sent_times[-1] < CHAT_MESSAGE_INTERVAL:
+            time.sleep(CHAT_MESSAGE_INTERVAL - (now - self._sent_times[-1]))
+            now = time.monotonic()
+        
+        # Drop sends that have left the one-second window, then wait for a free token
+        while self._sent_times and now - self._sent_times[0] >= 1.0:
+            self._sent_times.popleft()
+        if len(self._sent_times) >= MESSAGES_PER_SECOND:
+            time.sleep(1.0 - (now - self._sent_times[0]))
+            self._sent_times.popleft()
+        
+        self._sent_times.append(time.monotonic())
+    
     def send_daily_summary(self, articles: list[dict]) -> None:
         """Send daily summary of top articles"""
 
@@ -69,14 +109,13 @@ class TelegramBot:
 
             return None
             
-            # Build message
-        message = f"🤖 Daily AI Summary - {datetime.now().strftime('%B %d')}\n\n"
-        message += f"Click here to read more articles: {content_engine_https}\n\nTop Articles:\n\n"
-
-        for i, article in enumerate(articles, start=1):
-            title = article["title"]
-            message += f"{i}. {title}\n"
-            message += f"   {article['url']}\n\n"
+        # Build message
+        parts = [
+            f"🤖 Daily AI Summary - {datetime.now():%B %d}\n\n",
+            f"Click here to read more articles: {content_engine_https}\n\nTop Articles:\n\n"
+        ]
+        parts.extend(f"{i}. {article['title']}\n   {article['url']}\n\n" for i, article in enumerate(articles, start=1))
+        message = "".join(parts)
 
         self.send_message(message)
         
@@ -0,0 +1,121 @@
+"""
+Shared HTTP client - one pooled aiohttp session per collection run
+"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+# Keep-alive connections per host; a handful is plenty for feed servers and polite to them
+CONNECTIONS_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 30
+
+# Identify the client to feed and API servers (arXiv asks clients to)
+USER_AGENT = "ai-intel-hub/1.0"
+
+# Retry connection errors and transient server errors with backoff
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Validators and parsed items of previously fetched feeds, kept next to the saved feed
+HTTP_CACHE_FILE = "data/http_cache.json"
+
+
+def open_session() -> aiohttp.ClientSession:
+    """Create a session that reuses connections per host; must be called inside the event loop"""
+    connector = aiohttp.TCPConnector(limit_per_host=CONNECTIONS_PER_HOST, keepalive_timeout=KEEPALIVE_TIMEOUT)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        headers={"User-Agent": USER_AGENT}
+    )
+
+
+@asynccontextmanager
+async def get(session: aiohttp.ClientSession, url: str, **kwargs):
+    """GET a URL with retries; the final response is yielded rather than raised so callers keep their status checks"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await session.get(url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            response.release()
+
+        await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+
+    try:
+        yield response
+    finally:
+        response.release()
+
+
+async def run_with_session(fetch, *args, **kwargs):
+    """Await fetch(session, *args, **kwargs) on a session opened just for this call"""
+    async with open_session() as session:
+        return await fetch(session, *args, **kwargs)
+
+
+class ConditionalCache:
+    """Per-URL ETag/Last-Modified validators and parsed items, so unchanged feeds come back as 304s"""
+    
+    def __init__(self, path: str = HTTP_CACHE_FILE):
+        self.path = path
+        self.entries = self._load()
+    
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+    
+    def headers(self, url: str) -> dict:
+        """Conditional request headers for a URL fetched before"""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def items(self, url: str) -> list:
+        """Copies of the items parsed from the last full response for a URL"""
+        return [dict(item) for item in self.entries.get(url, {}).get("items", [])]
+    
+    def store(self, url: str, response: aiohttp.ClientResponse, items: list) -> None:
+        """Remember a response's validators with the items parsed from it"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # Nothing to revalidate with next time
+            self.entries.pop(url, None)
+            return
+        
+        # Copies, so scores the ranker later writes into the live items aren't cached with them
+        self.entries[url] = {"etag": etag, "last_modified": last_modified, "items": [dict(item) for item in items]}
+    
+    def save(self) -> None:
+        """Write the cache atomically so a crash never leaves a truncated file"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+# Module-level cache shared by all collectors
+HTTP_CACHE = ConditionalCache()
@@ -2,10 +2,7 @@
 Research Collector - Gathers AI research papers from academic sources
 """
 
-import urllib.request
-import urllib.parse
-import urllib.error
-import xml.etree.ElementTree as ET
+import asyncio
 from datetime import datetime
 from typing import List, Dict, Any
 import logging
@@ -13,10 +10,39 @@ import json
 import time
 
 try:
-    import requests
-    HAS_REQUESTS = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_REQUESTS = False
+    HAS_ORJSON = False
+
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+from collectors._http import HTTP_CACHE, get, run_with_session
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ARXIV_ENTRY_TAG = f'{{{ATOM_NS}}}entry'
+
+# Compiled once and run in C for every entry; smart_strings=False returns plain strings
+# that don't keep the (cleared) entry alive
+if HAS_LXML:
+    _XPATH_NAMESPACES = {'atom': ATOM_NS}
+    _TITLE_XPATH = ET.XPath('atom:title/text()', namespaces=_XPATH_NAMESPACES, smart_strings=False)
+    _SUMMARY_XPATH = ET.XPath('atom:summary/text()', namespaces=_XPATH_NAMESPACES, smart_strings=False)
+    _ID_XPATH = ET.XPath('atom:id/text()', namespaces=_XPATH_NAMESPACES, smart_strings=False)
+    _PUBLISHED_XPATH = ET.XPath('atom:published/text()', namespaces=_XPATH_NAMESPACES, smart_strings=False)
+    _AUTHORS_XPATH = ET.XPath('atom:author/atom:name/text()', namespaces=_XPATH_NAMESPACES, smart_strings=False)
+
+# Bytes handed to the XML parser per read from the arXiv response
+ARXIV_CHUNK_SIZE = 16 * 1024
+
+def _first(values: list):
+    """First result of an XPath text() query, or None"""
+    return values[0] if values else None
 
 class ResearchCollector:
     def __init__(self, research_sources: Dict[str, Any] = None):
@@ -25,102 +51,85 @@ class ResearchCollector:
     
     def gather_research_data(self, max_results: int = 10) -> List[Dict[str, Any]]:
         """Get recent AI papers from arXiv and Semantic Scholar"""
+        return asyncio.run(run_with_session(self.gather_research_data_async, max_results))
+    
+    async def gather_research_data_async(self, session, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Get recent AI papers from arXiv and Semantic Scholar, querying both at once"""
         self.logger.info("Starting research paper collection")
         
         papers = []
         
+        arxiv_papers, scholar_papers = await asyncio.gather(
+            self.collect_from_arxiv_async(session, max_results),
+            self.collect_from_semantic_scholar_async(session, max_results // 2),  # Request fewer to avoid limits
+            return_exceptions=True
+        )
+        
         # Collect from arXiv (always reliable)
-        arxiv_papers = self.collect_from_arxiv(max_results)
-        papers.extend(arxiv_papers)
+        if isinstance(arxiv_papers, Exception):
+            self.logger.error(f"Error fetching from arXiv: {arxiv_papers}")
+        else:
+            papers.extend(arxiv_papers)
         
         # Collect from Semantic Scholar (with rate limiting)
-        try:
-            scholar_papers = self.collect_from_semantic_scholar(max_results // 2)  # Request fewer to avoid limits
+        if isinstance(scholar_papers, Exception):
+            self.logger.warning(f"Semantic Scholar collection failed, continuing with arXiv only: {scholar_papers}")
+        else:
             papers.extend(scholar_papers)
-        except Exception as e:
-            self.logger.warning(f"Semantic Scholar collection failed, continuing with arXiv only: {e}")
+        
+        try:
+            HTTP_CACHE.save()
+        except OSError as e:
+            self.logger.warning(f"Could not save HTTP cache: {e}")
         
         self.logger.info(f"Collected {len(papers)} total papers")
         return papers
     
     def collect_from_arxiv(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Get recent AI papers from arXiv"""
+        return asyncio.run(run_with_session(self.collect_from_arxiv_async, max_results))
+    
+    async def collect_from_arxiv_async(self, session, max_results: int = 10) -> List[Dict[str, Any]]:
         """Get recent AI papers from arXiv"""
         self.logger.info("Fetching from arXiv...")
         
         url = f"http://export.arxiv.org/api/query?search_query=cat:cs.AI&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
         
+        # Define namespace map for arXiv XML
+        namespaces = {
+            'atom': ATOM_NS,
+            'arxiv': 'http://arxiv.org/schemas/atom'
+        }
+        
         try:
             papers = []
             
-            if HAS_REQUESTS:
-                try:
-                    response = requests.get(url, timeout=30)
-                    xml_content = response.text
-                except Exception:
-                    # Fallback to urllib
-                    with urllib.request.urlopen(url) as response:
-                        xml_content = response.read().decode('utf-8')
+            # Feed the response body to the parser as it arrives instead of buffering it
+            if HAS_LXML:
+                parser = ET.XMLPullParser(events=('end',), tag=ARXIV_ENTRY_TAG)
             else:
-                with urllib.request.urlopen(url) as response:
-                    xml_content = response.read().decode('utf-8')
-            
-            # Parse XML with proper namespace handling
-            root = ET.fromstring(xml_content)
+                parser = ET.XMLPullParser(events=('end',))
             
-            # Define namespace map for arXiv XML
-            namespaces = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
+            # Ask for a compressed listing explicitly; aiohttp inflates the chunks before the parser sees them
+            headers = {'Accept-Encoding': 'gzip, deflate', **HTTP_CACHE.headers(url)}
             
-            # Find all entry elements
-            entries = root.findall('atom:entry', namespaces)
+            async with get(session, url, headers=headers) as response:
+                if response.status == 304:
+                    # Listing unchanged since the last run; skip the download and the parse
+                    self.logger.info("arXiv listing not modified, reusing cached papers")
+                    return HTTP_CACHE.items(url)
+                
+                if response.status != 200:
+                    self.logger.warning(f"arXiv returned status {response.status}")
+                    return []
+                
+                async for chunk in response.content.iter_chunked(ARXIV_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    papers.extend(self._parse_arxiv_entries(parser, namespaces))
             
-            for entry in entries:
-                try:
-                    # Extract title
-                    title_elem = entry.find('atom:title', namespaces)
-                    title = title_elem.text.strip() if title_elem is not None else "No title"
-                    
-                    # Extract summary
-                    summary_elem = entry.find('atom:summary', namespaces)
-                    summary = summary_elem.text.strip() if summary_elem is not None else "No summary"
-                    
-                    # Extract arXiv ID and create URL
-                    id_elem = entry.find('atom:id', namespaces)
-                    if id_elem is not None:
-                        arxiv_id = id_elem.text.split('/')[-1]  # Extract ID from URL
-                        url = f"https://arxiv.org/abs/{arxiv_id}"
-                    else:
-                        url = "No URL available"
-                    
-                    # Extract published date
-                    published_elem = entry.find('atom:published', namespaces)
-                    published = published_elem.text if published_elem is not None else ""
-                    
-                    # Extract authors
-                    authors = []
-                    author_elements = entry.findall('atom:author', namespaces)
-                    for author in author_elements:
-                        name_elem = author.find('atom:name', namespaces)
-                        if name_elem is not None:
-                            authors.append(name_elem.text)
-                    
-                    paper = {
-                        'title': title,
-                        'summary': summary,
-                        'url': url,
-                        'source': 'arXiv',
-                        'published_date': published,
-                        'authors': authors,
-                        'category': 'Research Paper'
-                    }
-                    
-                    papers.append(paper)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error parsing arXiv entry: {e}")
-                    continue
+            parser.close()
+            papers.extend(self._parse_arxiv_entries(parser, namespaces))
+            HTTP_CACHE.store(url, response, papers)
             
             self.logger.info(f"Retrieved {len(papers)} papers from arXiv")
             return papers
@@ -129,14 +138,84 @@ class ResearchCollector:
             self.logger.error(f"Error fetching from arXiv: {e}")
             return []
     
+    def _parse_arxiv_entries(self, parser, namespaces: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Turn the Atom entries the pull parser has completed so far into papers"""
+        papers = []
+        
+        for _, entry in parser.read_events():
+            if entry.tag != ARXIV_ENTRY_TAG:
+                continue
+            
+            try:
+                title, summary, entry_id, published, authors = self._arxiv_entry_fields(entry, namespaces)
+                
+                title = title.strip() if title else "No title"
+                summary = summary.strip() if summary else "No summary"
+                
+                # Extract arXiv ID and create URL
+                if entry_id:
+                    arxiv_id = entry_id.split('/')[-1]  # Extract ID from URL
+                    url = f"https://arxiv.org/abs/{arxiv_id}"
+                else:
+                    url = "No URL available"
+                
+                published = published or ""
+                
+                paper = {
+                    'title': title,
+                    'summary': summary,
+                    'url': url,
+                    'source': 'arXiv',
+                    'published_date': published,
+                    'authors': authors,
+                    'category': 'Research Paper',
+                    'keywords': [],
+                    'source_type': 'research'
+                }
+                
+                papers.append(paper)
+                
+            except Exception as e:
+                self.logger.warning(f"Error parsing arXiv entry: {e}")
+            
+            # Free the processed entry and any earlier siblings to keep memory flat
+            entry.clear()
+            if HAS_LXML:
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+        
+        return papers
+    
+    def _arxiv_entry_fields(self, entry, namespaces: Dict[str, str]):
+        """Title, summary, id, published date (None when missing) and author names of an entry"""
+        if HAS_LXML:
+            return (
+                _first(_TITLE_XPATH(entry)),
+                _first(_SUMMARY_XPATH(entry)),
+                _first(_ID_XPATH(entry)),
+                _first(_PUBLISHED_XPATH(entry)),
+                _AUTHORS_XPATH(entry)
+            )
+        
+        def text(path):
+            elem = entry.find(path, namespaces)
+            return elem.text if elem is not None else None
+        
+        authors = [name.text for name in entry.findall('atom:author/atom:name', namespaces) if name.text]
+        return text('atom:title'), text('atom:summary'), text('atom:id'), text('atom:published'), authors
+    
     def collect_from_semantic_scholar(self, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Get recent AI papers from Semantic Scholar with rate limiting"""
+        return asyncio.run(run_with_session(self.collect_from_semantic_scholar_async, max_results))
+    
+    async def collect_from_semantic_scholar_async(self, session, max_results: int = 5) -> List[Dict[str, Any]]:
         """Get recent AI papers from Semantic Scholar with rate limiting"""
         self.logger.info("Fetching from Semantic Scholar...")
         
         # Rate limiting: wait at least 1 second between calls
         current_time = time.time()
         if current_time - self.last_semantic_scholar_call < 1.0:
-            time.sleep(1.0 - (current_time - self.last_semantic_scholar_call))
+            await asyncio.sleep(1.0 - (current_time - self.last_semantic_scholar_call))
         
         # Update call time
         self.last_semantic_scholar_call = time.time()
@@ -152,38 +231,19 @@ class ResearchCollector:
                 'fields': 'title,abstract,url,venue,year,authors,citationCount,publicationDate'
             }
             
-            if HAS_REQUESTS:
-                try:
-                    response = requests.get(search_url, params=params, timeout=30)
-                    if response.status_code == 429:  # Rate limited
-                        self.logger.warning("Semantic Scholar rate limited, skipping")
-                        return []
-                    
-                    if response.status_code != 200:
-                        self.logger.warning(f"Semantic Scholar returned status {response.status_code}")
-                        return []
-                    
-                    data = response.json()
-                except Exception as e:
-                    self.logger.warning(f"Requests failed for Semantic Scholar: {e}")
-                    # Fallback to urllib
-                    query_string = urllib.parse.urlencode(params)
-                    url_with_params = f"{search_url}?{query_string}"
-                    
-                    with urllib.request.urlopen(url_with_params) as response:
-                        if response.status == 429:
-                            self.logger.warning("Semantic Scholar rate limited, skipping")
-                            return []
-                        data = json.loads(response.read().decode('utf-8'))
-            else:
-                query_string = urllib.parse.urlencode(params)
-                url_with_params = f"{search_url}?{query_string}"
+            async with get(session, search_url, params=params) as response:
+                if response.status == 429:  # Rate limited
+                    self.logger.warning("Semantic Scholar rate limited, skipping")
+                    return []
                 
-                with urllib.request.urlopen(url_with_params) as response:
-                    if response.status == 429:
-                        self.logger.warning("Semantic Scholar rate limited, skipping")
-                        return []
-                    data = json.loads(response.read().decode('utf-8'))
+                if response.status != 200:
+                    self.logger.warning(f"Semantic Scholar returned status {response.status}")
+                    return []
+                
+                body = await response.read()
+            
+            # Decode the raw bytes directly; orjson skips the intermediate str
+            data = orjson.loads(body) if HAS_ORJSON else json.loads(body)
             
             # Process results
             if 'data' in data:
@@ -204,7 +264,9 @@ class ResearchCollector:
                             'category': 'Research Paper',
                             'venue': item.get('venue', ''),
                             'citation_count': item.get('citationCount', 0),
-                            'year': item.get('year', '')
+                            'year': item.get('year', ''),
+                            'keywords': [],
+                            'source_type': 'research'
                         }
                         
                         papers.append(paper)
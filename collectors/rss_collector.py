@@ -2,13 +2,98 @@
 RSS Collector - Gathers AI news and developments from RSS feeds
 """
 
-import requests
-import feedparser
+import asyncio
 import logging
 from datetime import datetime
+from io import BytesIO
 from typing import List, Dict, Any
+import html
 import re
 
+try:
+    from lxml import etree as ET
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+from collectors._http import HTTP_CACHE, get, run_with_session
+
+# Feed entry elements: RSS <item> and Atom <entry>
+FEED_ENTRY_TAGS = ('item', 'entry')
+
+# Entry children holding the summary text, in order of preference
+FEED_SUMMARY_TAGS = ('summary', 'description', 'content')
+
+# Default RSS sources for AI news, built once at import
+DEFAULT_SOURCES = (
+    {
+        "name": "MIT Technology Review AI",
+        "url": "https://www.technologyreview.com/feed/",
+        "category": "News"
+    },
+    {
+        "name": "Anthropic Blog",
+        "url": "https://www.anthropic.com/feed.xml",
+        "category": "AI Research"
+    },
+    {
+        "name": "OpenAI Blog",
+        "url": "https://openai.com/blog/rss.xml",
+        "category": "Company Blog"
+    },
+    {
+        "name": "Google AI Blog",
+        "url": "https://ai.googleblog.com/feeds/posts/default",
+        "category": "Company Blog"
+    }
+)
+
+# AI-related keywords used both to filter items and to tag them
+AI_KEYWORDS = (
+    'artificial intelligence', 'machine learning', 'deep learning',
+    'neural network', 'AI', 'ML', 'algorithm', 'automation',
+    'computer vision', 'natural language', 'NLP', 'robotics', 'chatbot',
+    'LLM', 'transformer', 'GPT', 'BERT', 'claude', 'openai'
+)
+
+# One scan over lower-cased text finds every keyword. Matches overlap so 'openai'
+# also counts as 'ai', as the per-keyword substring checks did. The Aho-Corasick
+# automaton scans in C; the regex lookahead is the fallback without pyahocorasick
+if HAS_AHOCORASICK:
+    _AI_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in AI_KEYWORDS:
+        _AI_AUTOMATON.add_word(_keyword.lower(), _keyword.lower())
+    _AI_AUTOMATON.make_automaton()
+else:
+    _AI_RE = re.compile('(?=(' + '|'.join(re.escape(keyword.lower()) for keyword in AI_KEYWORDS) + '))')
+
+def _find_ai_keywords(text: str) -> set:
+    """Lower-cased AI keywords occurring in already lower-cased text"""
+    if HAS_AHOCORASICK:
+        return {keyword for _, keyword in _AI_AUTOMATON.iter(text)}
+    return set(_AI_RE.findall(text))
+
+def _has_ai_keyword(text: str) -> bool:
+    """Whether already lower-cased text contains any AI keyword, stopping at the first"""
+    if HAS_AHOCORASICK:
+        return next(_AI_AUTOMATON.iter(text), None) is not None
+    return _AI_RE.search(text) is not None
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+def _local_name(tag) -> str:
+    """Strip the namespace from an element tag ('{ns}entry' -> 'entry')"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
 class RSSCollector:
     def __init__(self, rss_sources: List[Dict[str, str]] = None):
         self.rss_sources = rss_sources or self.get_default_sources()
@@ -16,83 +101,80 @@ class RSSCollector:
     
     def get_default_sources(self) -> List[Dict[str, str]]:
         """Default RSS sources for AI news"""
-        return [
-            {
-                "name": "MIT Technology Review AI",
-                "url": "https://www.technologyreview.com/feed/",
-                "category": "News"
-            },
-            {
-                "name": "Anthropic Blog",
-                "url": "https://www.anthropic.com/feed.xml",
-                "category": "AI Research"
-            },
-            {
-                "name": "OpenAI Blog",
-                "url": "https://openai.com/blog/rss.xml",
-                "category": "Company Blog"
-            },
-            {
-                "name": "Google AI Blog",
-                "url": "https://ai.googleblog.com/feeds/posts/default",
-                "category": "Company Blog"
-            }
-        ]
+        return list(DEFAULT_SOURCES)
     
     def gather_rss_data(self, max_sources: int = None) -> List[Dict[str, Any]]:
         """Collect data from all RSS sources"""
+        return asyncio.run(run_with_session(self.gather_rss_data_async, max_sources))
+    
+    async def gather_rss_data_async(self, session, max_sources: int = None) -> List[Dict[str, Any]]:
+        """Collect data from all RSS sources, fetching the feeds concurrently on one session"""
         self.logger.info("Starting RSS data collection")
         
-        all_items = []
         sources_to_process = self.rss_sources[:max_sources] if max_sources else self.rss_sources
         
-        for source in sources_to_process:
-            items = self.fetch_rss_feed(source)
-            all_items.extend(items)
+        results = await asyncio.gather(*(self.fetch_rss_feed_async(session, source) for source in sources_to_process))
+        
+        all_items = [item for items in results for item in items]
+        
+        try:
+            HTTP_CACHE.save()
+        except OSError as e:
+            self.logger.warning(f"Could not save HTTP cache: {e}")
         
         self.logger.info(f"Collected {len(all_items)} total items from RSS feeds")
         return all_items
     
     def fetch_rss_feed(self, source: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Fetch and parse a single RSS feed"""
+        return asyncio.run(run_with_session(self.fetch_rss_feed_async, source))
+    
+    async def fetch_rss_feed_async(self, session, source: Dict[str, str]) -> List[Dict[str, Any]]:
         """Fetch and parse a single RSS feed"""
         self.logger.info(f"Fetching from {source['name']}...")
         
         try:
-            response = requests.get(source["url"], timeout=30)
-            if response.status_code != 200:
-                self.logger.warning(f"Failed to fetch {source['name']}: HTTP {response.status_code}")
-                return []
+            url = source["url"]
+            async with get(session, url, headers=HTTP_CACHE.headers(url)) as response:
+                if response.status == 304:
+                    # Feed unchanged since the last run; skip the download and the parse
+                    self.logger.info(f"{source['name']} not modified, reusing cached items")
+                    return HTTP_CACHE.items(url)
+                
+                if response.status != 200:
+                    self.logger.warning(f"Failed to fetch {source['name']}: HTTP {response.status}")
+                    return []
+                
+                content = await response.read()
             
-            return self.parse_rss_content(response.text, source)
+            items = self.parse_rss_content(content, source)
+            HTTP_CACHE.store(url, response, items)
+            return items
             
         except Exception as e:
             self.logger.error(f"Error fetching {source['name']}: {e}")
             return []
     
-    def parse_rss_content(self, content: str, source: Dict[str, str]) -> List[Dict[str, Any]]:
+    def parse_rss_content(self, content: bytes, source: Dict[str, str]) -> List[Dict[str, Any]]:
         """Parse RSS content and extract relevant information"""
         try:
-            feed = feedparser.parse(content)
             items = []
             
-            for entry in feed.entries[:5]:  # Limit to 5 most recent
+            for entry in self._parse_feed(content, limit=5):  # Limit to 5 most recent
                 try:
                     # Extract content
-                    summary = ""
-                    if hasattr(entry, 'summary'):
-                        summary = self.clean_html(entry.summary)
-                    elif hasattr(entry, 'description'):
-                        summary = self.clean_html(entry.description)
+                    summary = self.clean_html(entry["summary"])
+                    title = entry["title"] or "No Title"
                     
                     item = {
-                        "title": entry.title if hasattr(entry, 'title') else "No Title",
+                        "title": title,
                         "summary": summary[:300] + "..." if len(summary) > 300 else summary,
-                        "url": entry.link if hasattr(entry, 'link') else "",
+                        "url": entry["link"],
                         "source": source["name"],
                         "category": source["category"],
                         "published_date": datetime.now().isoformat(),
-                        "collector": "rss",
-                        "keywords": self.extract_simple_keywords(entry.title + " " + summary)
+                        "keywords": self.extract_simple_keywords(title + " " + summary),
+                        "source_type": "rss"
                     }
                     
                     # Filter for AI-related content
@@ -110,16 +192,62 @@ class RSSCollector:
             self.logger.error(f"Error parsing RSS from {source['name']}: {e}")
             return []
     
+    def _parse_feed(self, content: bytes, limit: int = None) -> List[Dict[str, str]]:
+        """Extract title, link and summary from the RSS items or Atom entries of a feed"""
+        # libxml2 can recover from the minor breakage common in real-world feeds
+        options = {'recover': True} if HAS_LXML else {}
+        entries = []
+        
+        for _, elem in ET.iterparse(BytesIO(content), events=('end',), **options):
+            if _local_name(elem.tag) not in FEED_ENTRY_TAGS:
+                continue
+            
+            title, text_link, href_link = "", "", ""
+            texts = {}
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == 'title':
+                    title = "".join(child.itertext()).strip()
+                elif name == 'link':
+                    # RSS keeps the URL as text; Atom in href, where only rel="alternate"
+                    # (the default) is the item's page - not "self", "enclosure" and the like
+                    href = child.get('href')
+                    if href is None:
+                        text_link = text_link or (child.text or "").strip()
+                    elif not href_link and child.get('rel', 'alternate') == 'alternate':
+                        href_link = href
+                elif name in FEED_SUMMARY_TAGS and name not in texts:
+                    texts[name] = "".join(child.itertext())
+            
+            summary = next((texts[name] for name in FEED_SUMMARY_TAGS if texts.get(name)), "")
+            # An RSS <link> beats atom:link hrefs mixed into the same item
+            entries.append({"title": title, "link": text_link or href_link, "summary": summary})
+            
+            # Entry is fully read; drop its subtree
+            elem.clear()
+            if limit and len(entries) >= limit:
+                break
+        
+        return entries
+    
     def clean_html(self, text: str) -> str:
         """Remove HTML tags and clean text"""
         if not text:
             return ""
         
-        # Remove HTML tags
-        clean = re.sub('<.*?>', '', text)
+        # Remove HTML tags and decode entities; libxml2's HTML parser does both in one
+        # linear pass, the regex is the fallback without lxml or for unparseable input
+        clean = None
+        if HAS_LXML:
+            try:
+                clean = lxml.html.fragment_fromstring(text, create_parent='div').text_content()
+            except (ValueError, ET.ParserError):
+                pass
+        if clean is None:
+            clean = html.unescape(_TAG_RE.sub('', text))
         
         # Remove extra whitespace
-        clean = re.sub(r'\s+', ' ', clean).strip()
+        clean = _WS_RE.sub(' ', clean).strip()
         
         return clean
     
@@ -128,20 +256,8 @@ class RSSCollector:
         if not text:
             return []
         
-        # AI-related keywords to look for
-        ai_keywords = [
-            'artificial intelligence', 'machine learning', 'deep learning',
-            'neural network', 'AI', 'ML', 'algorithm', 'automation',
-            'computer vision', 'natural language', 'robotics', 'chatbot',
-            'LLM', 'transformer', 'GPT', 'BERT', 'claude', 'openai'
-        ]
-        
-        text_lower = text.lower()
-        found_keywords = []
-        
-        for keyword in ai_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
+        found = _find_ai_keywords(text.lower())
+        found_keywords = [keyword for keyword in AI_KEYWORDS if keyword.lower() in found]
         
         return found_keywords[:5]  # Limit to 5 keywords
     
@@ -149,11 +265,4 @@ class RSSCollector:
         """Check if an item is AI-related"""
         text = f"{item.get('title', '')} {item.get('summary', '')}".lower()
         
-        ai_terms = [
-            'ai', 'artificial intelligence', 'machine learning', 'ml',
-            'deep learning', 'neural network', 'algorithm', 'automation',
-            'computer vision', 'natural language', 'nlp', 'robotics',
-            'chatbot', 'llm', 'gpt', 'transformer', 'openai', 'claude'
-        ]
-        
-        return any(term in text for term in ai_terms)
\ No newline at end of file
+        return _has_ai_keyword(text)
\ No newline at end of file
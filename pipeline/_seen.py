@@ -0,0 +1,62 @@
+"""
+Seen-item store - remembers which URLs earlier runs already ranked
+"""
+
+import dbm
+import logging
+import os
+import shelve
+import time
+from typing import List, Dict, Any
+
+# Forget items after this long so the store stays small
+SEEN_MAX_AGE_DAYS = 30
+
+
+def _item_key(item: Dict[str, Any], key: str) -> str:
+    """URL identifying an item, or None for placeholders like "No URL available" that can't"""
+    value = item.get(key) or ""
+    return value if value.startswith(("http://", "https://")) else None
+
+
+class SeenStore:
+    """URLs already handled by the pipeline, persisted with the time they were marked"""
+
+    def __init__(self, path: str, max_age_days: int = SEEN_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.logger = logging.getLogger("seen_store")
+
+    def unseen(self, items: List[Dict[str, Any]], key: str = "url") -> List[Dict[str, Any]]:
+        """Return the items not marked before; items without a usable URL are always kept"""
+        if not os.path.exists(os.path.dirname(self.path) or "."):
+            return items
+
+        now = time.time()
+        try:
+            with shelve.open(self.path) as seen:
+                return [
+                    item for item in items
+                    if (item_key := _item_key(item, key)) is None
+                    or now - seen.get(item_key, 0) > self.max_age
+                ]
+        except (OSError, dbm.error) as e:
+            self.logger.warning(f"Seen-item store unavailable, keeping all items: {e}")
+            return items
+
+    def mark(self, items: List[Dict[str, Any]], key: str = "url") -> None:
+        """Record items as seen and prune entries older than the max age"""
+        now = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with shelve.open(self.path) as seen:
+                expired = [seen_key for seen_key, marked in seen.items() if now - marked > self.max_age]
+                for seen_key in expired:
+                    del seen[seen_key]
+
+                for item in items:
+                    item_key = _item_key(item, key)
+                    if item_key is not None:
+                        seen[item_key] = now
+        except (OSError, dbm.error) as e:
+            self.logger.warning(f"Could not record seen items: {e}")
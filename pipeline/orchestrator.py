@@ -3,18 +3,40 @@ Content Intelligence Pipeline
 Main orchestrator that coordinates all collectors and intelligence components
 """
 
+import asyncio
 import logging
 import json
 import os
 from datetime import datetime
 from typing import List, Dict, Any
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Updated imports for new structure
+from collectors._http import open_session
 from collectors.research_collector import ResearchCollector
 from collectors.rss_collector import RSSCollector
 from assistants.content_ranker import ContentRanker
-from assistants.idea_generator import IdeaGenerator
+from assistants.idea_generator import FALLBACK_ARTICLE_IDEA, FALLBACK_POST_IDEA, IdeaGenerator
 from assistants.telegram_bot import TelegramBot
+from pipeline._seen import SeenStore
+
+# Feed file written by the pipeline and served by the web app
+FEED_DATA_FILE = "data/latest_feed.json"
+
+# URLs already ranked by a scheduled run, skipped later so only new content is ranked
+SEEN_ITEMS_FILE = "data/seen_items"
+
+# Placeholder ideas set when idea generation fails as a whole
+MANUAL_POST_IDEA = "Manual post idea needed"
+MANUAL_ARTICLE_IDEA = "Manual article idea needed"
+
+# Ideas that mean generation failed; articles carrying them are retried by the next run
+PLACEHOLDER_IDEAS = {FALLBACK_POST_IDEA, FALLBACK_ARTICLE_IDEA, MANUAL_POST_IDEA, MANUAL_ARTICLE_IDEA}
 
 class ContentPipeline:
     def __init__(self):
@@ -23,24 +45,16 @@ class ContentPipeline:
         self.content_ranker = ContentRanker()
         self.idea_generator = IdeaGenerator()
         self.logger = logging.getLogger("content_pipeline")
+        self.seen = SeenStore(SEEN_ITEMS_FILE)
     
     def gather_all_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from all sources"""
         self.logger.info("Starting data collection from all sources")
         
         try:
-            # Collect from research sources
-            research_data = self.research_collector.gather_research_data(max_results=10)
-            
-            # Collect from RSS sources  
-            rss_data = self.rss_collector.gather_rss_data()
+            data_collected = asyncio.run(self.gather_all_data_async())
             
-            data_collected = {
-                "research": research_data,
-                "rss": rss_data
-            }
-            
-            total_items = len(research_data) + len(rss_data)
+            total_items = len(data_collected["research"]) + len(data_collected["rss"])
             self.logger.info(f"Collected {total_items} total items")
             
             return data_collected
@@ -49,27 +63,25 @@ class ContentPipeline:
             self.logger.error(f"Error during data collection: {e}")
             return {"research": [], "rss": []}
     
+    async def gather_all_data_async(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Collect from research and RSS sources at the same time over one pooled session"""
+        async with open_session() as session:
+            research_data, rss_data = await asyncio.gather(
+                self.research_collector.gather_research_data_async(session, max_results=10),
+                self.rss_collector.gather_rss_data_async(session)
+            )
+        
+        return {
+            "research": research_data,
+            "rss": rss_data
+        }
+    
     def clean_and_structure_data(self, raw_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """Clean and structure data for processing"""
         self.logger.info("Cleaning and structuring collected data")
         
-        structured = []
-        
-        for source_type, items in raw_data.items():
-            if isinstance(items, list) and items:
-                for item in items:
-                    structured_item = {
-                        "title": item.get("title", ""),
-                        "summary": item.get("summary", ""),
-                        "source": item.get("source", ""),
-                        "url": item.get("url", ""),
-                        "published_date": item.get("published_date", ""),
-                        "category": item.get("category", ""),
-                        "keywords": item.get("keywords", []),
-                        "source_type": source_type,
-                        "original_data": item  # Keep reference to original
-                    }
-                    structured.append(structured_item)
+        # Collectors already emit structured items tagged with their source_type
+        structured = raw_data.get("research", []) + raw_data.get("rss", [])
         
         self.logger.info(f"Structured {len(structured)} items")
         return structured
@@ -102,12 +114,12 @@ class ContentPipeline:
             self.logger.error(f"Error during idea generation: {e}")
             # Fallback: add placeholder ideas
             for article in ranked_articles:
-                article["post_idea"] = "Manual post idea needed"
-                article["article_idea"] = "Manual article idea needed"
+                article["post_idea"] = MANUAL_POST_IDEA
+                article["article_idea"] = MANUAL_ARTICLE_IDEA
             return ranked_articles
     
-    def run_complete_pipeline(self, top_n: int = 10) -> Dict[str, Any]:
-        """Run the complete content intelligence pipeline"""
+    def run_complete_pipeline(self, top_n: int = 10, skip_seen: bool = False) -> Dict[str, Any]:
+        """Run the complete content intelligence pipeline, optionally over items no earlier run ranked"""
         self.logger.info("Starting complete content intelligence pipeline")
         
         try:
@@ -117,6 +129,11 @@ class ContentPipeline:
             # Step 2: Clean and structure the data
             structured_data = self.clean_and_structure_data(raw_data)
             
+            # Items reused from 304 responses are filtered here too
+            if skip_seen:
+                structured_data = self.seen.unseen(structured_data)
+                self.logger.info(f"{len(structured_data)} items not ranked by an earlier run")
+            
             # Step 3: Rank content by AI relevance
             ranked_content = self.rank_content_by_relevance(structured_data, top_n)
             
@@ -131,6 +148,7 @@ class ContentPipeline:
                 "ideas_generated": len(final_ideas),
                 "ranked_articles": ranked_content,
                 "content_ideas": final_ideas,
+                "candidate_articles": structured_data,
                 "sources_used": list(raw_data.keys())
             }
             
@@ -145,7 +163,52 @@ class ContentPipeline:
                 "status": "failed"
             }
     
-    def generate_content_and_notify(self):
+    def save_feed_data(self, content_ideas: List[Dict[str, Any]], data_file: str = FEED_DATA_FILE) -> Dict[str, Any]:
+        """Save pipeline results to the file the web app serves and return what was written"""
+        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        
+        feed_data = {
+            "last_updated": datetime.now().isoformat(),
+            "content_ideas": content_ideas
+        }
+        
+        # orjson emits indented UTF-8 bytes in one call, written with a single write
+        if HAS_ORJSON:
+            payload = orjson.dumps(feed_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(feed_data, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        # Write a temp file and swap it in, so the web app never reads a half-written feed
+        tmp_file = f"{data_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, data_file)
+        
+        print(f"Results saved to {data_file}")
+        return feed_data
+    
+    def _has_ideas(self, article: Dict[str, Any]) -> bool:
+        """Whether an article carries generated post and article ideas rather than placeholders"""
+        return all(
+            article.get(field) and article.get(field) not in PLACEHOLDER_IDEAS
+            for field in ('post_idea', 'article_idea')
+        )
+    
+    def load_saved_ideas(self, data_file: str = FEED_DATA_FILE) -> List[Dict[str, Any]]:
+        """Content ideas from the saved feed, or an empty list if there is none"""
+        try:
+            with open(data_file, 'rb') as f:
+                data = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read saved feed: {e}")
+            return []
+        
+        ideas = data.get('content_ideas', []) if isinstance(data, dict) else []
+        return [idea for idea in ideas if isinstance(idea, dict)] if isinstance(ideas, list) else []
+    
+    def generate_content_and_notify(self, top_n: int = 10):
         """Generate fresh content pipeline results and send notification via Telegram"""
         try:
             # Initialize telegram bot
@@ -153,26 +216,37 @@ class ContentPipeline:
             
             # Generate fresh content
             print("Running content pipeline...")
-            results = self.run_complete_pipeline()
+            results = self.run_complete_pipeline(top_n, skip_seen=True)
+            new_ideas = results.get('content_ideas', [])
             
-            # Save results to file for web app to use
-            data_file = "data/latest_feed.json"
-            os.makedirs("data", exist_ok=True)
+            # Nothing new (or a failed run): keep serving the current feed and don't re-notify
+            if not new_ideas and os.path.exists(FEED_DATA_FILE):
+                if results.get('status') == 'failed':
+                    print(f"Pipeline failed, keeping the current feed: {results.get('error')}")
+                else:
+                    print("No new articles since the last run, keeping the current feed")
+                return
             
-            feed_data = {
-                "last_updated": datetime.now().isoformat(),
-                "content_ideas": results.get('content_ideas', [])
-            }
+            # New articles go on top of the current feed rather than replacing it
+            saved_ideas = self.load_saved_ideas()
+            saved_urls = {article.get('url') for article in saved_ideas}
+            new_urls = {article.get('url') for article in new_ideas}
+            kept = [article for article in saved_ideas if article.get('url') not in new_urls]
+            articles = (new_ideas + kept)[:top_n]
             
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(feed_data, f, indent=2, ensure_ascii=False)
+            # Save results to file for web app to use
+            self.save_feed_data(articles)
             
-            print(f"Results saved to {data_file}")
-
-            # Read articles from saved data
-            with open(data_file, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-                articles = saved_data.get('content_ideas', [])
+            # Only after a successful save, mark everything this run ranked - including items
+            # below the cut - so later runs don't re-rank leftovers. Articles whose ideas failed
+            # stay unmarked so the next run regenerates them
+            failed_urls = {article.get('url') for article in new_ideas if not self._has_ideas(article)}
+            self.seen.mark([article for article in results.get('candidate_articles', []) if article.get('url') not in failed_urls])
+            
+            # Retried articles already in the feed are no news; notify only for articles it gained
+            if not any(article.get('url') not in saved_urls for article in new_ideas):
+                print("No new articles added to the feed, skipping the summary")
+                return
             
             # Send notification
             print("Sending content summary...")
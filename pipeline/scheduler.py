@@ -0,0 +1,41 @@
+"""
+Scheduler - Runs the content pipeline and Telegram summary on a fixed interval
+"""
+
+import logging
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from pipeline.orchestrator import ContentPipeline
+
+# Minutes between pipeline runs; runs with nothing new keep the feed and skip the summary
+RUN_INTERVAL_MINUTES = 15
+
+def run_weekly_summary():
+    """Generate fresh content and send the Telegram summary"""
+    try:
+        ContentPipeline().generate_content_and_notify()
+    except Exception as e:
+        # Already logged by the pipeline; keep the scheduler alive for the next run
+        print(f"Scheduled run failed: {e}")
+
+def start_scheduler():
+    """Block and run the summary every RUN_INTERVAL_MINUTES, sleeping until each run is due"""
+    scheduler = BlockingScheduler()
+    scheduler.add_job(
+        run_weekly_summary,
+        'interval',
+        minutes=RUN_INTERVAL_MINUTES,
+        max_instances=1,
+        coalesce=True
+    )
+
+    print(f"Scheduler started, running every {RUN_INTERVAL_MINUTES} minutes")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        print("Scheduler stopped")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    start_scheduler()